@@ -6,6 +6,7 @@ import pandas as pd
 import threading
 import time
 import pyperclip
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from streamlit.runtime.scriptrunner.script_runner import RerunException, RerunData
 
@@ -14,7 +15,7 @@ ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
-from src.infer import predict
+from src.infer import predict_rules, score_label, build_outputs
 from src.config import MODELS_DIR, FEEDBACK_CSV, LABEL_COLS
 from src.ml_pipeline import load_models
 
@@ -53,9 +54,38 @@ div.stButton > button:hover {
 </style>
 """, unsafe_allow_html=True)
 
+# --- Background executor + model warm-up (shared across sessions) ---
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=len(LABEL_COLS) + 1, thread_name_prefix="predict")
+
+def _load_and_warm_models() -> dict:
+    models = load_models()
+    # One dummy pass per label so the first real request doesn't pay for lazy init
+    for model_info in models.values():
+        score_label(["warm up"], model_info)
+    return models
+
+def _score_unless_cancelled(cancel: threading.Event, text: str, model_info):
+    # Skip heads of an abandoned request that are still queued on the shared pool
+    if cancel.is_set():
+        return None
+    return score_label([text], model_info)
+
+def _models_stamp() -> tuple:
+    # Changes whenever `python -m src.train` rewrites the artifacts
+    return tuple(sorted((p.name, p.stat().st_mtime) for p in MODELS_DIR.glob("*.joblib")))
+
+@st.cache_resource(max_entries=1)
+def get_models_future(stamp: tuple):
+    return get_executor().submit(_load_and_warm_models)
+
+get_models_future(_models_stamp())  # start loading as soon as the app starts, without blocking
+
 # --- Session state initialization ---
 for key, default in {
     "models": None,
+    "cancel_event": None,
     "latest_preds": {},
     "fb_values": {},
     "predicted_once": False,
@@ -69,6 +99,13 @@ for key, default in {
     if key not in st.session_state:
         st.session_state[key] = default
 
+# --- Cancel this session's earlier prediction, if any ---
+# Streamlit runs one script at a time per session, so a prediction still in flight
+# belongs to a run that was interrupted and can no longer show its results.
+# Heads already scoring finish; queued ones are skipped.
+if st.session_state["cancel_event"] is not None:
+    st.session_state["cancel_event"].set()
+
 # --- Normalization helpers ---
 _ws_re = re.compile(r"\s+")
 def _normalize_free_text(x: str) -> str:
@@ -120,6 +157,9 @@ user_text = st.text_area(
     disabled=disable_all
 )
 
+# Live view, filled progressively while a prediction is running
+live_area = st.empty()
+
 btn_col1, btn_col2 = st.columns([1, 1])
 with btn_col1:
     if st.button("🔮 Predict", key="predict_btn", disabled=disable_all):
@@ -128,27 +168,61 @@ with btn_col1:
         else:
             try:
                 if st.session_state["models"] is None:
-                    st.session_state["models"] = load_models()
+                    with st.spinner("Loading models..."):
+                        try:
+                            st.session_state["models"] = get_models_future(_models_stamp()).result()
+                        except Exception:
+                            get_models_future.clear()  # retry loading on the next click
+                            raise
+                models = st.session_state["models"]
 
-                if not st.session_state["models"]:
+                if not models:
                     st.error("⚠️ Something went wrong while preparing predictions. Please try again later.")
                 else:
-                    res = predict(user_text, models=st.session_state["models"])
-                    if isinstance(res, dict) and "final" in res:
-                        formatted_preds = {key: ", ".join(res["final"].get(key, [])) for key in LABEL_COLS}
-
-                        # --- ✅ Reset to initial state ---
-                        st.session_state["latest_preds"] = formatted_preds
-                        st.session_state["fb_values"] = formatted_preds.copy()
-                        st.session_state["predicted_once"] = True
-                        st.session_state["editable_boxes"] = {k: False for k in LABEL_COLS}
-                        st.session_state["active_box"] = None
-                        st.session_state["editing_temp"] = {}
-                        st.session_state["copied_box"] = None
-                        st.session_state["copied_time"] = None
-
-                    else:
-                        st.error("⚠️ Something went wrong while preparing predictions. Please try again later.")
+                    executor = get_executor()
+                    cancel = threading.Event()
+                    st.session_state["cancel_event"] = cancel
+                    label_futures = {
+                        executor.submit(_score_unless_cancelled, cancel, user_text, model_info): key
+                        for key, model_info in models.items()
+                    }
+
+                    # --- Rule-based matches are shown straight away ---
+                    rule_preds, matched_keywords, rule_priors = predict_rules(user_text, models)
+                    ml_scores = {}
+
+                    with live_area.container():
+                        live_cols = st.columns(len(LABEL_COLS))
+                        live_boxes = {key: live_cols[idx].empty() for idx, key in enumerate(LABEL_COLS)}
+
+                    def render_live(res: dict):
+                        for key in LABEL_COLS:
+                            values = ", ".join(res["final"].get(key, [])) or "—"
+                            status = "✅" if key in ml_scores or key not in models else "⏳"
+                            live_boxes[key].markdown(f"**{key}** {status}\n\n{values}")
+
+                    res = build_outputs(rule_preds, matched_keywords, rule_priors, ml_scores, models)
+                    render_live(res)
+
+                    # --- Each ML head fills in as soon as it finishes ---
+                    for fut in as_completed(label_futures):
+                        ml_scores[label_futures[fut]] = fut.result()[0]
+                        res = build_outputs(rule_preds, matched_keywords, rule_priors, ml_scores, models)
+                        render_live(res)
+
+                    live_area.empty()
+
+                    formatted_preds = {key: ", ".join(res["final"].get(key, [])) for key in LABEL_COLS}
+
+                    # --- ✅ Reset to initial state ---
+                    st.session_state["latest_preds"] = formatted_preds
+                    st.session_state["fb_values"] = formatted_preds.copy()
+                    st.session_state["predicted_once"] = True
+                    st.session_state["editable_boxes"] = {k: False for k in LABEL_COLS}
+                    st.session_state["active_box"] = None
+                    st.session_state["editing_temp"] = {}
+                    st.session_state["copied_box"] = None
+                    st.session_state["copied_time"] = None
             except Exception:
                 st.error("⚠️ Something went wrong while preparing predictions. Please try again later.")
 
@@ -19,6 +19,11 @@ LABEL_COLS = ["disease_type", "stage_subtype", "line_of_therapy", "biomarker"]
 # --- Other configs ---
 RANDOM_STATE = 42
 
+# --- Scoring configs ---
+DEFAULT_THRESHOLD = 0.5   # per-class probability cut-off stored with new artifacts
+TOP_K = 3                 # alternatives returned per label
+RULE_KEYWORD_PRIOR = 0.6  # confidence contributed by each matching keyword
+
 # --- Ensure folders exist ---
 for folder in [DATA_DIR / "train", DATA_DIR / "test", FEEDBACK_CSV.parent, OUTPUTS_DIR, MODELS_DIR]:
     folder.mkdir(parents=True, exist_ok=True)
@@ -36,3 +36,26 @@ def merge_predictions(
         provenance[k] = prov
 
     return out, provenance
+
+def merge_confidences(
+    merged: Dict[str, List[str]],
+    rule_priors: Dict[str, Dict[str, float]],
+    ml_probs: Dict[str, Dict[str, float]]
+) -> Dict[str, Dict[str, float]]:
+    """
+    Combine rule-based priors and ML probabilities for each merged value.
+    Sources are treated as independent evidence (noisy-OR), so a value
+    backed by both is more confident than either alone.
+
+    Returns:
+        confidence: per label, value -> confidence in [0, 1]
+    """
+    confidence = {}
+    for k, values in merged.items():
+        rprior = rule_priors.get(k) or {}
+        mprob = ml_probs.get(k) or {}
+        confidence[k] = {
+            v: 1.0 - (1.0 - rprior.get(v, 0.0)) * (1.0 - mprob.get(v, 0.0))
+            for v in values
+        }
+    return confidence
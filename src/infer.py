@@ -1,5 +1,8 @@
-from .ensemble import merge_predictions
-from .rule_based import load_mapping, match_keywords
+from typing import Any, Dict, List, Sequence, Tuple
+from .config import TOP_K
+from .ensemble import merge_predictions, merge_confidences
+from .ml_pipeline import score_texts
+from .rule_based import load_mapping, match_keywords_with_hits, keyword_priors
 import numpy as np
 
 # Load rule-based keyword mapping safely
@@ -16,72 +19,99 @@ def _empty_outputs(models: dict) -> dict:
     Assumes all labels are multilabel.
     """
     if not models:
-        return {"final": {}, "rule_based": {}, "ml_only": {}, "provenance": {}, "explanations": {}}
+        return {
+            "final": {}, "rule_based": {}, "ml_only": {}, "provenance": {},
+            "confidence": {}, "ml_scores": {}, "explanations": {}
+        }
 
     return {
         "final": {k: [] for k in models.keys()},
         "rule_based": {k: [] for k in models.keys()},
         "ml_only": {k: [] for k in models.keys()},
         "provenance": {k: {} for k in models.keys()},
+        "confidence": {k: {} for k in models.keys()},
+        "ml_scores": {k: _empty_score() for k in models.keys()},
         "explanations": {
             "matched_keywords": [],
+            "rule_priors": {k: {} for k in models.keys()},
             "tfidf_top_terms": {k: [] for k in models.keys()}
         }
     }
 
 
-def predict(text: str, models: dict) -> dict:
+def _empty_score() -> Dict[str, Any]:
+    return {"labels": [], "probabilities": {}, "top_k": []}
+
+
+def predict_rules(
+    text: str,
+    models: dict
+) -> Tuple[Dict[str, List[str]], List[str], Dict[str, Dict[str, float]]]:
     """
-    Predict multilabel outputs for all labels using rule-based and ML models.
-    Returns merged predictions, provenance, and explanations.
+    Run the rule-based keyword layer only.
+    Returns rule predictions per label, the matched keywords and
+    per-value confidence priors derived from keyword hits.
     """
-    if not isinstance(text, str) or not text.strip():
-        return _empty_outputs(models)
-
-    # --- Rule-based predictions ---
     try:
         if _keyword_mapping is not None:
-            rule_preds, matched_keywords = match_keywords(text, _keyword_mapping)
+            rule_preds, matched_keywords, hits = match_keywords_with_hits(text, _keyword_mapping)
             # Ensure each rule prediction is a list
             rule_preds = {k: v if isinstance(v, list) else [v] for k, v in rule_preds.items()}
-        else:
-            rule_preds, matched_keywords = {k: [] for k in models.keys()}, []
+            return rule_preds, matched_keywords, keyword_priors(hits)
     except Exception:
-        rule_preds, matched_keywords = {k: [] for k in models.keys()}, []
+        pass
+    return {k: [] for k in models.keys()}, [], {k: {} for k in models.keys()}
+
 
-    # --- ML predictions ---
-    ml_preds = {}
-    for key, model_info in models.items():
-        if not isinstance(model_info, dict):
-            model_info = {"pipeline": model_info, "mlb": None}
+def score_label(texts: Sequence[str], model_info, top_k: int = TOP_K) -> List[Dict[str, Any]]:
+    """
+    Score a batch of texts with a single ML label head.
+    Returns one score dict per text (labels, probabilities, top_k);
+    empty scores on failure.
+    """
+    if not isinstance(model_info, dict):
+        model_info = {"pipeline": model_info, "mlb": None}
 
-        pipe = model_info.get("pipeline")
-        mlb = model_info.get("mlb")
+    pipe = model_info.get("pipeline")
+    mlb = model_info.get("mlb")
 
-        if pipe is None:
-            ml_preds[key] = []
-            continue
+    if pipe is None:
+        return [_empty_score() for _ in texts]
 
-        try:
+    try:
+        if mlb is not None:
+            return score_texts(texts, model_info, top_k=top_k)
+        # No binarizer: fall back to plain predictions without scores
+        results = []
+        for text in texts:
             pred = pipe.predict([text])
-            if mlb is not None:
-                labels = mlb.inverse_transform(pred)
-                ml_preds[key] = list(labels[0]) if labels and labels[0] else []
-            else:
-                # Ensure always a list
-                if isinstance(pred, (list, np.ndarray)):
-                    ml_preds[key] = [str(p) for p in pred.flatten()]
-                else:
-                    ml_preds[key] = [str(pred)]
-        except Exception:
-            ml_preds[key] = []
-
-    # --- Merge rule-based + ML predictions ---
+            labels = [str(p) for p in np.asarray(pred).flatten()]
+            results.append({"labels": labels, "probabilities": {}, "top_k": []})
+        return results
+    except Exception:
+        return [_empty_score() for _ in texts]
+
+
+def build_outputs(
+    rule_preds: Dict[str, List[str]],
+    matched_keywords: List[str],
+    rule_priors: Dict[str, Dict[str, float]],
+    ml_scores: Dict[str, Dict[str, Any]],
+    models: dict
+) -> dict:
+    """
+    Merge rule-based and (possibly partial) ML scores into the
+    output dict returned by `predict`.
+    """
+    ml_preds = {k: list(s["labels"]) for k, s in ml_scores.items()}
     final, provenance = merge_predictions(rule_preds, ml_preds)
+    confidence = merge_confidences(
+        final, rule_priors, {k: s["probabilities"] for k, s in ml_scores.items()}
+    )
 
-    # --- Explanations ---
     explanations = {
         "matched_keywords": matched_keywords,
+        "rule_priors": rule_priors,
         "tfidf_top_terms": {k: [] for k in models.keys()}  # placeholder
     }
 
@@ -90,5 +120,38 @@ def predict(text: str, models: dict) -> dict:
         "rule_based": rule_preds,
         "ml_only": ml_preds,
         "provenance": provenance,
+        "confidence": confidence,
+        "ml_scores": ml_scores,
         "explanations": explanations
     }
+
+
+def predict_batch(texts: Sequence[str], models: dict, top_k: int = TOP_K) -> List[dict]:
+    """
+    Predict multilabel outputs for a batch of texts.
+    Each label head scores the whole batch once; labels, probabilities
+    and top-k alternatives all come from that single pass.
+    """
+    texts = list(texts)
+    valid = [i for i, t in enumerate(texts) if isinstance(t, str) and t.strip()]
+
+    # --- ML scores: one pass per label over all non-empty texts ---
+    batch_scores = {
+        key: score_label([texts[i] for i in valid], model_info, top_k=top_k)
+        for key, model_info in models.items()
+    } if valid else {}
+
+    outputs = [_empty_outputs(models) for _ in texts]
+    for pos, i in enumerate(valid):
+        rule_preds, matched_keywords, rule_priors = predict_rules(texts[i], models)
+        ml_scores = {key: scores[pos] for key, scores in batch_scores.items()}
+        outputs[i] = build_outputs(rule_preds, matched_keywords, rule_priors, ml_scores, models)
+    return outputs
+
+
+def predict(text: str, models: dict) -> dict:
+    """
+    Predict multilabel outputs for all labels using rule-based and ML models.
+    Returns merged predictions, provenance, confidences and explanations.
+    """
+    return predict_batch([text], models)[0]
@@ -1,12 +1,14 @@
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Sequence
+import numpy as np
 import pandas as pd
+from scipy.special import expit
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import MultiLabelBinarizer
-from sklearn.multiclass import OneVsRestClassifier
+from sklearn.multiclass import OneVsRestClassifier, _ConstantPredictor
 from joblib import dump, load
-from src.config import MODELS_DIR, TEXT_COLS, LABEL_COLS
+from src.config import MODELS_DIR, TEXT_COLS, LABEL_COLS, DEFAULT_THRESHOLD, TOP_K
 from src.preprocessing import combine_text, split_multilabel
 
 def _make_vectorizer():
@@ -15,6 +17,18 @@ def _make_vectorizer():
 def _clf_multilabel():
     return OneVsRestClassifier(LogisticRegression(max_iter=1000, n_jobs=-1))
 
+def _default_thresholds(mlb: MultiLabelBinarizer) -> np.ndarray:
+    return np.full(len(mlb.classes_), DEFAULT_THRESHOLD, dtype=float)
+
+def _unpack_artifact(obj) -> Dict[str, Any]:
+    # Older artifacts were saved as (pipe, mlb) without thresholds
+    if len(obj) == 3:
+        pipe, mlb, thresholds = obj
+    else:
+        pipe, mlb = obj
+        thresholds = _default_thresholds(mlb)
+    return {"pipeline": pipe, "mlb": mlb, "thresholds": np.asarray(thresholds, dtype=float)}
+
 def train_models(
     df: pd.DataFrame,
     load_existing: bool = False,
@@ -45,7 +59,8 @@ def train_models(
         task_name = f"{label} ({task_type})"
 
         if load_existing and model_path.exists():
-            pipe, mlb = load(model_path)
+            loaded = _unpack_artifact(load(model_path))
+            pipe, mlb, thresholds = loaded["pipeline"], loaded["mlb"], loaded["thresholds"]
         else:
             # --- Prepare multilabel target ---
             y = df[label].fillna("").map(split_multilabel)
@@ -65,13 +80,14 @@ def train_models(
                 return artifacts
 
             pipe.fit(X, Y)
+            thresholds = _default_thresholds(mlb)
 
             if save_to_disk:
                 if not progress_callback(step_counter, total_steps, f"Saving {task_name}"):
                     return artifacts
-                dump((pipe, mlb), model_path)
+                dump((pipe, mlb, thresholds), model_path)
 
-        artifacts[label] = {"pipeline": pipe, "mlb": mlb}
+        artifacts[label] = {"pipeline": pipe, "mlb": mlb, "thresholds": thresholds}
 
     return artifacts
 
@@ -80,6 +96,44 @@ def load_models() -> Dict[str, Dict[str, Any]]:
     for label in LABEL_COLS:
         path = MODELS_DIR / f"{label}.joblib"
         if path.exists():
-            pipe, mlb = load(path)
-            models[label] = {"pipeline": pipe, "mlb": mlb}
+            models[label] = _unpack_artifact(load(path))
     return models
+
+def score_texts(
+    texts: Sequence[str],
+    model_info: Dict[str, Any],
+    top_k: int = TOP_K
+) -> List[Dict[str, Any]]:
+    """
+    Score a batch of texts for one label with a single decision_function pass.
+    Returns one dict per text with:
+        labels: classes whose probability exceeds their threshold
+        probabilities: class -> probability
+        top_k: best (class, probability) pairs, highest first
+    """
+    pipe = model_info["pipeline"]
+    classes = list(model_info["mlb"].classes_)
+    thresholds = model_info.get("thresholds")
+    if thresholds is None:
+        thresholds = _default_thresholds(model_info["mlb"])
+
+    features = pipe[:-1].transform(list(texts))
+    clf = pipe[-1]
+    scores = np.asarray(clf.decision_function(features), dtype=float)
+    probs = expit(scores.reshape(len(texts), len(classes)))
+    # Classes present in every (or no) training row get a constant predictor,
+    # whose decision_function is the raw 0/1 label rather than a logit
+    for j, est in enumerate(getattr(clf, "estimators_", [])):
+        if isinstance(est, _ConstantPredictor):
+            probs[:, j] = float(est.y_[0])
+    decisions = probs > thresholds  # same cut-off as pipe.predict at 0.5
+    order = np.argsort(-probs, axis=1)[:, :top_k]
+
+    results = []
+    for i in range(len(texts)):
+        results.append({
+            "labels": [classes[j] for j in np.flatnonzero(decisions[i])],
+            "probabilities": {c: float(p) for c, p in zip(classes, probs[i])},
+            "top_k": [(classes[j], float(probs[i, j])) for j in order[i]],
+        })
+    return results
@@ -1,6 +1,7 @@
 import pandas as pd
 from collections import defaultdict
-from .config import KEYWORDS_CSV, LABEL_COLS
+from typing import Dict
+from .config import KEYWORDS_CSV, LABEL_COLS, RULE_KEYWORD_PRIOR
 
 def load_mapping(path=KEYWORDS_CSV) -> pd.DataFrame:
     """
@@ -14,15 +15,16 @@ def load_mapping(path=KEYWORDS_CSV) -> pd.DataFrame:
         df = pd.read_csv(path, dtype=str, keep_default_na=False, encoding='utf-8')
     return df.fillna("")
 
-def match_keywords(text: str, mapping_df: pd.DataFrame):
+def match_keywords_with_hits(text: str, mapping_df: pd.DataFrame):
     """
     Match keywords in text to generate multilabel predictions.
     Returns:
         - dict of label -> list of matched values
         - list of matched keywords
+        - dict of label -> {value: number of keywords voting for it}
     """
     text_low = str(text).lower()
-    votes = defaultdict(set)
+    votes = defaultdict(lambda: defaultdict(int))
     matched = []
 
     for _, row in mapping_df.iterrows():
@@ -34,13 +36,33 @@ def match_keywords(text: str, mapping_df: pd.DataFrame):
             for col in LABEL_COLS:
                 val = row.get(col)
                 if val:
-                    for v in str(val).split(";"):
-                        v = v.strip()
+                    for v in {v.strip() for v in str(val).split(";")}:
                         if v:
-                            votes[col].add(v)
+                            votes[col][v] += 1
             matched.append(kw)
 
     # Ensure all LABEL_COLS are present, even if empty
-    results = {k: sorted(list(votes.get(k, []))) for k in LABEL_COLS}
+    results = {k: sorted(votes.get(k, {})) for k in LABEL_COLS}
+    hits = {k: dict(votes.get(k, {})) for k in LABEL_COLS}
+
+    return results, sorted(set(matched)), hits
+
+def match_keywords(text: str, mapping_df: pd.DataFrame):
+    """
+    Match keywords in text to generate multilabel predictions.
+    Returns:
+        - dict of label -> list of matched values
+        - list of matched keywords
+    """
+    results, matched, _ = match_keywords_with_hits(text, mapping_df)
+    return results, matched
 
-    return results, sorted(set(matched))
+def keyword_priors(hits: Dict[str, Dict[str, int]], per_hit: float = RULE_KEYWORD_PRIOR) -> Dict[str, Dict[str, float]]:
+    """
+    Turn keyword hit counts into confidence priors in [0, 1].
+    Each extra keyword voting for the same value raises its prior.
+    """
+    return {
+        k: {v: 1.0 - (1.0 - per_hit) ** n for v, n in counts.items()}
+        for k, counts in hits.items()
+    }
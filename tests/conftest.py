@@ -0,0 +1,21 @@
+import pandas as pd
+import pytest
+from src.config import TRAIN_CSV
+from src.ml_pipeline import train_models
+
+@pytest.fixture(scope="session")
+def train_df():
+    return pd.read_csv(TRAIN_CSV, dtype=str, keep_default_na=False)
+
+@pytest.fixture(scope="session")
+def models(train_df):
+    return train_models(train_df, save_to_disk=False, progress_callback=lambda *args: True)
+
+@pytest.fixture(scope="session")
+def texts():
+    return [
+        "EGFR+ Stage IV NSCLC first-line",
+        "Adjuvant therapy in early ER+ breast cancer",
+        "KRAS mutant colorectal cancer, second-line",
+        "BRAF melanoma",
+    ]
@@ -0,0 +1,9 @@
+from src.ensemble import merge_predictions, merge_confidences
+
+def test_merge_confidences():
+    rule = {"biomarker": ["EGFR"]}
+    ml = {"biomarker": ["EGFR", "KRAS"]}
+    final, _ = merge_predictions(rule, ml)
+    conf = merge_confidences(final, {"biomarker": {"EGFR": 0.6}}, {"biomarker": {"EGFR": 0.5, "KRAS": 0.7}})
+    assert abs(conf["biomarker"]["EGFR"] - 0.8) < 1e-9
+    assert abs(conf["biomarker"]["KRAS"] - 0.7) < 1e-9
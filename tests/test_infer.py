@@ -0,0 +1,42 @@
+from src.ensemble import merge_predictions
+from src.infer import predict, predict_batch, predict_rules, build_outputs, score_label, _empty_outputs, _keyword_mapping
+from src.rule_based import match_keywords
+
+def _legacy_final(text, models):
+    # Reference: the predict.pipe + inverse_transform path used before scoring
+    rule_preds, _ = match_keywords(text, _keyword_mapping)
+    ml_preds = {}
+    for key, info in models.items():
+        labels = info["mlb"].inverse_transform(info["pipeline"].predict([text]))
+        ml_preds[key] = list(labels[0]) if labels and labels[0] else []
+    return merge_predictions(rule_preds, ml_preds)[0]
+
+def test_predict_batch_skips_empty(models):
+    out = predict_batch(["", "EGFR+ NSCLC", None], models)
+    assert len(out) == 3
+    assert out[0] == _empty_outputs(models)
+    assert out[2] == _empty_outputs(models)
+    assert out[1]["final"]["biomarker"]
+    assert out[1]["explanations"]["matched_keywords"]
+
+def test_predict_final_unchanged(models, texts):
+    for text in texts:
+        assert predict(text, models)["final"] == _legacy_final(text, models)
+
+def test_build_outputs_partial_heads(models):
+    text = "EGFR+ Stage IV NSCLC first-line"
+    rule_preds, matched_keywords, rule_priors = predict_rules(text, models)
+    # Only one head has finished, as in the app's progressive view
+    ml_scores = {"disease_type": score_label([text], models["disease_type"])[0]}
+    out = build_outputs(rule_preds, matched_keywords, rule_priors, ml_scores, models)
+
+    assert out["ml_only"] == {"disease_type": ml_scores["disease_type"]["labels"]}
+    assert out["final"]["biomarker"] == rule_preds["biomarker"] == ["EGFR"]
+    for key in ("stage_subtype", "line_of_therapy", "biomarker"):
+        assert out["final"][key] == rule_preds[key]
+        assert all(src == "rule" for src in out["provenance"][key].values())
+
+    # Once every head is in, the result equals predict()
+    ml_scores = {key: score_label([text], info)[0] for key, info in models.items()}
+    full = build_outputs(rule_preds, matched_keywords, rule_priors, ml_scores, models)
+    assert full == predict(text, models)
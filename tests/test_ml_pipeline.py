@@ -0,0 +1,52 @@
+import numpy as np
+from joblib import dump, load
+from src.config import DEFAULT_THRESHOLD
+from src.ml_pipeline import score_texts, train_models, _unpack_artifact
+
+def _assert_matches_predict(info, texts):
+    pipe, mlb = info["pipeline"], info["mlb"]
+    scores = score_texts(texts, info)
+    expected = mlb.inverse_transform(pipe.predict(texts))
+    assert [s["labels"] for s in scores] == [list(e) for e in expected]
+
+    probs = pipe.predict_proba(texts)
+    got = np.array([[s["probabilities"][c] for c in mlb.classes_] for s in scores])
+    assert np.allclose(got, probs)
+
+def test_score_texts_matches_predict(models, texts):
+    for info in models.values():
+        _assert_matches_predict(info, texts)
+
+def test_score_texts_constant_class(train_df, texts):
+    # A class present in every row is fitted with a constant predictor
+    df = train_df.copy()
+    df["biomarker"] = df["biomarker"] + ";ALL"
+    info = train_models(df, save_to_disk=False, progress_callback=lambda *args: True)["biomarker"]
+    _assert_matches_predict(info, texts)
+    assert all(s["probabilities"]["ALL"] == 1.0 for s in score_texts(texts, info))
+
+def test_score_texts_top_k(models, texts):
+    for info in models.values():
+        for s in score_texts(texts, info, top_k=2):
+            probs = [p for _, p in s["top_k"]]
+            assert len(probs) <= 2
+            assert probs == sorted(probs, reverse=True)
+
+def test_unpack_artifact_formats(models, texts, tmp_path):
+    info = models["biomarker"]
+    pipe, mlb = info["pipeline"], info["mlb"]
+
+    dump((pipe, mlb), tmp_path / "legacy.joblib")
+    legacy = _unpack_artifact(load(tmp_path / "legacy.joblib"))
+    assert len(legacy["thresholds"]) == len(mlb.classes_)
+    assert np.all(legacy["thresholds"] == DEFAULT_THRESHOLD)
+
+    # Every probability exceeds 0.0, so all classes are returned
+    dump((pipe, mlb, np.zeros(len(mlb.classes_))), tmp_path / "current.joblib")
+    current = _unpack_artifact(load(tmp_path / "current.joblib"))
+    assert np.all(current["thresholds"] == 0.0)
+
+    legacy_labels = [s["labels"] for s in score_texts(texts, legacy)]
+    current_labels = [s["labels"] for s in score_texts(texts, current)]
+    assert current_labels == [list(mlb.classes_)] * len(texts)
+    assert current_labels != legacy_labels
@@ -0,0 +1,19 @@
+import pandas as pd
+from src.config import RULE_KEYWORD_PRIOR
+from src.rule_based import match_keywords_with_hits, keyword_priors
+
+def test_keyword_hits_and_priors():
+    mapping = pd.DataFrame([
+        {"keyword": "egfr", "disease_type": "", "stage_subtype": "", "line_of_therapy": "", "biomarker": "EGFR;EGFR"},
+        {"keyword": "egfr mutation", "disease_type": "", "stage_subtype": "", "line_of_therapy": "", "biomarker": "EGFR"},
+        {"keyword": "kras", "disease_type": "", "stage_subtype": "", "line_of_therapy": "", "biomarker": "KRAS"},
+    ])
+    results, matched, hits = match_keywords_with_hits("Confirmed EGFR mutation", mapping)
+    assert results["biomarker"] == ["EGFR"]
+    assert matched == ["egfr", "egfr mutation"]
+    # Duplicates within a row count once; overlapping keywords stack
+    assert hits["biomarker"] == {"EGFR": 2}
+    assert hits["disease_type"] == {}
+
+    priors = keyword_priors(hits)
+    assert abs(priors["biomarker"]["EGFR"] - (1 - (1 - RULE_KEYWORD_PRIOR) ** 2)) < 1e-9